@@ -24,6 +24,6 @@ class PerfilUsuarioAdmin(admin.ModelAdmin):
 # Configuración para Archivos
 @admin.register(Archivo)
 class ArchivoAdmin(admin.ModelAdmin):
-    list_display = ('nombre_personalizado', 'area', 'subido_por', 'fecha_creacion')
+    list_display = ('nombre_personalizado', 'area', 'subido_por', 'fecha_creacion', 'visitas')
     list_filter = ('area', 'fecha_creacion')
     search_fields = ('nombre_personalizado',)
\ No newline at end of file
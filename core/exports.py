@@ -0,0 +1,107 @@
+# core/exports.py
+import csv
+import json
+
+from django.db.models import Q
+from django.urls import reverse
+
+from .models import Archivo
+
+# Cuántas filas se piden a la base de datos en cada consulta.
+# El backend de MySQL (PyMySQL) no usa cursores del lado del servidor: .iterator()
+# igual descarga todo el resultado. Por eso paginamos por llave (fecha, id) y cada
+# consulta trae como máximo CHUNK_SIZE filas.
+CHUNK_SIZE = 2000
+
+FORMATOS = ('csv', 'ndjson')
+
+COLUMNAS = ['nombre', 'link_publico', 'link_drive', 'subido_por', 'fecha_creacion']
+
+# Excel interpreta como fórmula cualquier celda que empiece con estos caracteres
+PREFIJOS_FORMULA = ('=', '+', '-', '@', '\t', '\r')
+
+# Sin BOM, Excel abre el CSV como ANSI y los acentos salen corruptos
+UTF8_BOM = '\ufeff'
+
+
+class _Eco:
+    """
+    Pseudo-archivo para csv.writer: en lugar de guardar, devuelve la línea escrita.
+    """
+    def write(self, value):
+        return value
+
+
+def _celda_segura(valor):
+    """
+    Antepone un apóstrofo a los valores que Excel ejecutaría como fórmula.
+    """
+    if isinstance(valor, str) and valor.startswith(PREFIJOS_FORMULA):
+        return "'" + valor
+    return valor
+
+
+def _iter_bloques(area):
+    """
+    Devuelve las filas del área en bloques de CHUNK_SIZE, de la más reciente a la
+    más antigua. Cada bloque sigue después de la última (fecha, id) vista, así que
+    la memoria no crece con el número de archivos.
+    """
+    base = (
+        Archivo.objects
+        .filter(area=area)
+        .order_by('-fecha_creacion', '-id')
+        .values_list('id', 'nombre_personalizado', 'slug', 'google_drive_link',
+                     'subido_por__username', 'fecha_creacion')
+    )
+    qs = base
+    while True:
+        bloque = list(qs[:CHUNK_SIZE])
+        if not bloque:
+            return
+        yield from bloque
+        if len(bloque) < CHUNK_SIZE:
+            return
+        ultimo_id, ultima_fecha = bloque[-1][0], bloque[-1][5]
+        qs = base.filter(
+            Q(fecha_creacion__lt=ultima_fecha) | Q(fecha_creacion=ultima_fecha, id__lt=ultimo_id)
+        )
+
+
+def iter_filas(area):
+    """
+    Recorre los archivos del área por bloques y devuelve
+    un diccionario por fila con las columnas de COLUMNAS.
+    """
+    filas = _iter_bloques(area)
+    for _id, nombre, slug, link_drive, usuario, fecha in filas:
+        yield {
+            'nombre': nombre,
+            # Ruta pública de serve_file; el llamador le agrega el dominio
+            'link_publico': reverse('serve_file', kwargs={'area_slug': area.slug, 'file_slug': slug}),
+            'link_drive': link_drive,
+            'subido_por': usuario or '',
+            'fecha_creacion': fecha.isoformat() if fecha else '',
+        }
+
+
+def stream_export(area, formato='csv', base_url=''):
+    """
+    Genera el contenido de la exportación línea por línea (CSV o NDJSON).
+    'base_url' se antepone al link público, p. ej. 'https://midominio.mx'.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato no soportado: {formato}. Usa uno de {', '.join(FORMATOS)}")
+
+    base_url = base_url.rstrip('/')
+
+    if formato == 'csv':
+        writer = csv.writer(_Eco())
+        yield UTF8_BOM + writer.writerow(COLUMNAS)
+        for fila in iter_filas(area):
+            fila['link_publico'] = base_url + fila['link_publico']
+            yield writer.writerow([_celda_segura(fila[c]) for c in COLUMNAS])
+    else:
+        for fila in iter_filas(area):
+            fila['link_publico'] = base_url + fila['link_publico']
+            yield json.dumps(fila, ensure_ascii=False) + '\n'
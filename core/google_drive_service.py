@@ -1,12 +1,10 @@
 # core/google_drive_service.py
 import os
 import io
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload
 from django.conf import settings
-from google.auth.exceptions import RefreshError # Para manejar errores de token
+# Las librerías de Google (googleapiclient, google.auth) se importan dentro de las
+# funciones: son pesadas y así no retrasan el arranque de cada worker.
+# Con gunicorn --preload se cargan una sola vez en el proceso maestro (ver warmup()).
 # Si necesitas un token fresco y no tienes el refresh_token, 
 # la siguiente línea es la que realizaría el flujo interactivo (pero la quitamos)
 # from google_auth_oauthlib.flow import InstalledAppFlow 
@@ -17,11 +15,27 @@ SCOPES = ['https://www.googleapis.com/auth/drive']
 TOKEN_URI = 'https://oauth2.googleapis.com/token'
 
 
+def warmup():
+    """
+    Importa por adelantado las librerías de Google Drive.
+    gunicorn.conf.py la llama en el maestro para que los workers las hereden ya cargadas.
+    """
+    import google.oauth2.credentials  # noqa: F401
+    import google.auth.transport.requests  # noqa: F401
+    import googleapiclient.discovery  # noqa: F401
+    import googleapiclient.http  # noqa: F401
+
+
 def get_drive_service():
     """
     Autentica y devuelve un objeto de servicio de la API de Drive
     usando variables de settings.py (con REFRESH_TOKEN para persistencia).
     """
+    from google.oauth2.credentials import Credentials
+    from google.auth.transport.requests import Request
+    from google.auth.exceptions import RefreshError # Para manejar errores de token
+    from googleapiclient.discovery import build
+
     creds = None
     
     # --- 1. Obtener las variables de settings.py ---
@@ -68,17 +82,24 @@ def get_drive_service():
 
     return build('drive', 'v3', credentials=creds)
 
-def create_folder_if_not_exists(service, folder_name):
+def find_folder(service, folder_name):
     """
-    Busca una carpeta por nombre. Si no existe, la crea.
-    Devuelve el ID de la carpeta.
+    Busca una carpeta por nombre. Devuelve su ID o None si no existe.
     """
     query = f"mimeType='application/vnd.google-apps.folder' and name='{folder_name}' and trashed=false"
     response = service.files().list(q=query, spaces='drive', fields='files(id, name)').execute()
     files = response.get('files', [])
+    return files[0].get('id') if files else None
 
-    if files:
-        return files[0].get('id')
+def create_folder_if_not_exists(service, folder_name):
+    """
+    Busca una carpeta por nombre. Si no existe, la crea.
+    Devuelve el ID de la carpeta.
+    """
+    folder_id = find_folder(service, folder_name)
+
+    if folder_id:
+        return folder_id
     else:
         file_metadata = {
             'name': folder_name,
@@ -88,10 +109,84 @@ def create_folder_if_not_exists(service, folder_name):
         return folder.get('id')
 
 
+def list_folder_files(service, folder_id, page_token=None, page_size=1000):
+    """
+    Lista UNA página de archivos (no carpetas) dentro de una carpeta.
+    Solo pide los campos necesarios para registrar el archivo. 'fileExtension' solo
+    viene en archivos subidos (no en Docs/Sheets/Slides, cuyo nombre no tiene extensión).
+    Devuelve (lista_de_archivos, token_de_la_siguiente_pagina).
+    """
+    query = f"'{folder_id}' in parents and mimeType!='application/vnd.google-apps.folder' and trashed=false"
+    response = service.files().list(
+        q=query,
+        spaces='drive',
+        pageSize=page_size,
+        pageToken=page_token,
+        fields='nextPageToken, files(id, name, fileExtension, webViewLink)'
+    ).execute()
+    return response.get('files', []), response.get('nextPageToken')
+
+
+# Drive acepta como máximo 100 llamadas por petición batch
+PERMISSIONS_BATCH_SIZE = 100
+
+# Errores que suelen resolverse solos si se reintenta más tarde (límites de uso, fallas del servidor)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+RATE_LIMIT_REASONS = ('rateLimitExceeded', 'userRateLimitExceeded')
+
+def is_retryable_error(exception):
+    """
+    Indica si vale la pena reintentar una llamada que falló con este error.
+    """
+    resp = getattr(exception, 'resp', None)
+    status = getattr(resp, 'status', None)
+    if status is None:
+        # Sin respuesta HTTP (timeout, conexión cortada): se reintenta
+        return True
+    status = int(status)
+    if status in RETRYABLE_STATUS:
+        return True
+    if status == 403:
+        content = getattr(exception, 'content', b'') or b''
+        if isinstance(content, bytes):
+            content = content.decode('utf-8', 'replace')
+        return any(reason in content for reason in RATE_LIMIT_REASONS)
+    return False
+
+def make_files_public(service, file_ids):
+    """
+    Hace públicos (lectura con el enlace) varios archivos usando peticiones batch.
+    Devuelve un diccionario {id: reintentable} con los archivos que NO se pudieron
+    actualizar; 'reintentable' es False para errores permanentes (p. ej. 404, 403 sin límite de uso).
+    """
+    permission = {
+        'type': 'anyone',
+        'role': 'reader'
+    }
+    fallidos = {}
+
+    def _callback(request_id, response, exception):
+        if exception is not None:
+            print(f"Error al hacer público el archivo {request_id}: {exception}")
+            fallidos[request_id] = is_retryable_error(exception)
+
+    for i in range(0, len(file_ids), PERMISSIONS_BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=_callback)
+        for file_id in file_ids[i:i + PERMISSIONS_BATCH_SIZE]:
+            batch.add(
+                service.permissions().create(fileId=file_id, body=permission, fields='id'),
+                request_id=file_id
+            )
+        batch.execute()
+
+    return fallidos
+
 def upload_file_to_drive(file_obj, area_slug):
     """
     Sube un archivo a una carpeta específica en Google Drive, lo hace público y devuelve su ID y enlace.
     """
+    from googleapiclient.http import MediaIoBaseUpload
+
     service = get_drive_service()
     
     # 1. Obtiene o crea la carpeta para el área municipal
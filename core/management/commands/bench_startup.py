@@ -0,0 +1,65 @@
+# core/management/commands/bench_startup.py
+import os
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Lo mismo que hace un worker de gunicorn al arrancar: cargar la app WSGI y las URLs
+STARTUP_CODE = (
+    "from link_generator.wsgi import application; "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+
+# Módulos que NO deberían cargarse al arrancar (se importan en el primer uso)
+LAZY_MODULES = ('googleapiclient', 'google.oauth2', 'PIL', 'pypdf')
+
+
+class Command(BaseCommand):
+    help = "Mide el tiempo de importación de la app (como un worker de gunicorn) y muestra los módulos más lentos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20, help="Cuántos módulos mostrar")
+        parser.add_argument('--repeticiones', type=int, default=3, help="Arranques a medir; se reporta el más rápido")
+
+    def handle(self, *args, **options):
+        mejor = None
+        for _ in range(options['repeticiones']):
+            tiempos = self._medir()
+            if mejor is None or self._total(tiempos) < self._total(mejor):
+                mejor = tiempos
+
+        self.stdout.write(f"Arranque total: {self._total(mejor) / 1000:.1f} ms ({len(mejor)} módulos)")
+        self.stdout.write(f"{'acumulado (ms)':>15} {'propio (ms)':>12}  módulo")
+        ranking = sorted(mejor.items(), key=lambda item: item[1][1], reverse=True)
+        for modulo, (propio, acumulado) in ranking[:options['top']]:
+            self.stdout.write(f"{acumulado / 1000:>15.1f} {propio / 1000:>12.1f}  {modulo}")
+
+        cargados = sorted(m for m in mejor if any(m == l or m.startswith(l + '.') for l in LAZY_MODULES))
+        if cargados:
+            self.stdout.write(self.style.WARNING(
+                "Se importaron al arrancar módulos que deberían ser diferidos: " + ", ".join(cargados[:10])
+            ))
+
+    def _medir(self):
+        """
+        Arranca un intérprete nuevo con -X importtime y devuelve
+        {modulo: (propio_us, acumulado_us)} leído de su stderr.
+        """
+        resultado = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_CODE],
+            capture_output=True, text=True, env=os.environ.copy()
+        )
+        if resultado.returncode != 0:
+            raise CommandError(f"Falló el arranque de prueba:\n{resultado.stderr[-2000:]}")
+
+        tiempos = {}
+        for linea in resultado.stderr.splitlines():
+            if not linea.startswith('import time:') or 'self [us]' in linea:
+                continue
+            propio, acumulado, modulo = linea[len('import time:'):].split('|')
+            tiempos[modulo.strip()] = (int(propio), int(acumulado))
+        return tiempos
+
+    def _total(self, tiempos):
+        return sum(propio for propio, _ in tiempos.values())
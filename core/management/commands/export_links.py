@@ -0,0 +1,31 @@
+# core/management/commands/export_links.py
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import AreaMunicipal
+from core import exports
+
+
+class Command(BaseCommand):
+    help = "Exporta los links públicos de un área en CSV o NDJSON (en streaming, memoria constante)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('area_slug', help="Slug del área a exportar")
+        parser.add_argument('--formato', choices=exports.FORMATOS, default='csv')
+        parser.add_argument('--base-url', default='', help="Dominio a anteponer al link público, p. ej. https://midominio.mx")
+        parser.add_argument('--salida', default=None, help="Archivo de salida (por defecto, la salida estándar)")
+
+    def handle(self, *args, **options):
+        try:
+            area = AreaMunicipal.objects.get(slug=options['area_slug'])
+        except AreaMunicipal.DoesNotExist:
+            raise CommandError(f"No existe el área '{options['area_slug']}'")
+
+        lineas = exports.stream_export(area, options['formato'], base_url=options['base_url'])
+
+        if options['salida']:
+            with open(options['salida'], 'w', encoding='utf-8', newline='') as destino:
+                destino.writelines(lineas)
+            self.stderr.write(self.style.SUCCESS(f"Exportación guardada en {options['salida']}"))
+        else:
+            for linea in lineas:
+                self.stdout.write(linea, ending='')
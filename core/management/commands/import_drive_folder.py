@@ -0,0 +1,198 @@
+# core/management/commands/import_drive_folder.py
+import json
+import os
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.crypto import get_random_string
+from django.utils.text import slugify
+
+from core.models import Archivo, AreaMunicipal
+from core import google_drive_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Registra como Archivo los archivos que ya existen en la carpeta de Drive de un área. "
+        "Se puede reanudar: guarda el avance en un archivo de checkpoint después de cada página."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('area_slug', help="Slug del área (también es el nombre de su carpeta en Drive)")
+        parser.add_argument('--usuario', default=None, help="Username que quedará como 'subido_por'")
+        parser.add_argument('--page-size', type=int, default=1000, help="Archivos por página de Drive (máx. 1000)")
+        parser.add_argument('--batch-size', type=int, default=500, help="Filas por INSERT de bulk_create")
+        parser.add_argument('--checkpoint', default=None, help="Ruta del checkpoint (por defecto import_drive_<area>.json)")
+        parser.add_argument('--reiniciar', action='store_true', help="Ignora el checkpoint y empieza desde la primera página")
+        parser.add_argument('--reintentos', type=int, default=4, help="Reintentos (con espera creciente) para errores temporales de Drive")
+
+    def handle(self, *args, **options):
+        try:
+            area = AreaMunicipal.objects.get(slug=options['area_slug'])
+        except AreaMunicipal.DoesNotExist:
+            raise CommandError(f"No existe el área '{options['area_slug']}'")
+
+        usuario = None
+        if options['usuario']:
+            try:
+                usuario = User.objects.get(username=options['usuario'])
+            except User.DoesNotExist:
+                raise CommandError(f"No existe el usuario '{options['usuario']}'")
+
+        checkpoint_path = options['checkpoint'] or f"import_drive_{area.slug}.json"
+        checkpoint = {} if options['reiniciar'] else self._leer_checkpoint(checkpoint_path)
+
+        service = google_drive_service.get_drive_service()
+        folder_id = checkpoint.get('folder_id') or google_drive_service.find_folder(service, area.slug)
+        if not folder_id:
+            raise CommandError(f"No existe la carpeta '{area.slug}' en Drive")
+
+        page_token = checkpoint.get('page_token')
+        paginas_terminadas = checkpoint.get('paginas_terminadas', False)
+        total = checkpoint.get('importados', 0)
+        # Archivos que Drive no dejó hacer públicos. Los 'fallidos' (límite de uso, 5xx) se
+        # reintentan al final con espera; los 'rechazados' (4xx permanentes) solo se reportan.
+        # Al reanudar se vuelven a intentar ambos (p. ej. si ya se corrigieron los permisos).
+        fallidos = checkpoint.get('fallidos', []) + checkpoint.get('rechazados', [])
+        rechazados = []
+        if page_token or paginas_terminadas:
+            self.stdout.write(f"Reanudando desde el checkpoint ({total} archivos ya importados)")
+
+        while not paginas_terminadas:
+            files, next_token = google_drive_service.list_folder_files(
+                service, folder_id, page_token=page_token, page_size=options['page_size']
+            )
+            importados, fallidos_pagina, rechazados_pagina = self._importar_pagina(
+                service, area, usuario, files, options['batch_size']
+            )
+            total += importados
+            fallidos.extend(fallidos_pagina)
+            rechazados.extend(rechazados_pagina)
+
+            # Solo avanzamos el checkpoint cuando la página ya quedó guardada
+            page_token = next_token
+            paginas_terminadas = not next_token
+            self._guardar_checkpoint(checkpoint_path, {
+                'folder_id': folder_id,
+                'page_token': page_token,
+                'paginas_terminadas': paginas_terminadas,
+                'importados': total,
+                'fallidos': fallidos,
+                'rechazados': rechazados,
+            })
+            self.stdout.write(f"{total} archivos importados...")
+
+        # Espera creciente (2, 4, 8, ... s) para dar tiempo a que Drive libere el límite de uso
+        for intento in range(options['reintentos']):
+            if not fallidos:
+                break
+            espera = 2 ** (intento + 1)
+            self.stdout.write(
+                f"Reintentando {len(fallidos)} archivos que no se pudieron hacer públicos "
+                f"en {espera} s (intento {intento + 1} de {options['reintentos']})..."
+            )
+            time.sleep(espera)
+            importados, fallidos, rechazados_reintento = self._importar_pagina(
+                service, area, usuario, fallidos, options['batch_size']
+            )
+            total += importados
+            rechazados.extend(rechazados_reintento)
+
+        if fallidos or rechazados:
+            # Dejamos el checkpoint para que la siguiente ejecución solo reintente estos
+            self._guardar_checkpoint(checkpoint_path, {
+                'folder_id': folder_id,
+                'page_token': None,
+                'paginas_terminadas': True,
+                'importados': total,
+                'fallidos': fallidos,
+                'rechazados': rechazados,
+            })
+            raise CommandError(
+                f"Importación incompleta: {total} archivos importados en '{area.nombre}'; "
+                f"{len(fallidos)} siguen fallando por errores temporales de Drive y "
+                f"{len(rechazados)} fueron rechazados (errores permanentes). "
+                f"Se guardaron en {checkpoint_path}; vuelve a ejecutar el comando para reintentarlos"
+            )
+
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        self.stdout.write(self.style.SUCCESS(f"Importación terminada: {total} archivos en '{area.nombre}'"))
+
+    def _importar_pagina(self, service, area, usuario, files, batch_size):
+        """
+        Registra una página de archivos de Drive. Omite los que ya estaban registrados,
+        así que repetir una página (p. ej. tras un corte) no duplica filas.
+        Devuelve (cuántos se importaron, fallidos reintentables, rechazados permanentes).
+        """
+        ids = [f['id'] for f in files]
+        ya_registrados = set(
+            Archivo.objects.filter(google_drive_file_id__in=ids).values_list('google_drive_file_id', flat=True)
+        )
+        nuevos = [f for f in files if f['id'] not in ya_registrados]
+        if not nuevos:
+            return 0, [], []
+
+        errores = google_drive_service.make_files_public(service, [f['id'] for f in nuevos])
+        fallidos = [f for f in nuevos if errores.get(f['id']) is True]
+        rechazados = [f for f in nuevos if errores.get(f['id']) is False]
+        nuevos = [f for f in nuevos if f['id'] not in errores]
+
+        nombres = [self._nombre_sin_extension(f) for f in nuevos]
+        slugs = self._generar_slugs(nombres)
+        registros = []
+        for drive_file, nombre, slug in zip(nuevos, nombres, slugs):
+            registros.append(Archivo(
+                nombre_personalizado=nombre[:255],
+                slug=slug,
+                area=area,
+                subido_por=usuario,
+                google_drive_link=drive_file['webViewLink'],
+                google_drive_file_id=drive_file['id'],
+            ))
+
+        with transaction.atomic():
+            Archivo.objects.bulk_create(registros, batch_size=batch_size)
+        return len(registros), fallidos, rechazados
+
+    def _nombre_sin_extension(self, drive_file):
+        """
+        Quita la extensión solo si es la real del archivo ('fileExtension' de Drive).
+        Los Docs/Sheets/Slides no tienen extensión: "Acta 12.03.2024" se queda igual.
+        """
+        nombre = drive_file['name']
+        extension = drive_file.get('fileExtension')
+        if extension and nombre.lower().endswith(f".{extension.lower()}"):
+            nombre = nombre[:-(len(extension) + 1)]
+        return nombre
+
+    def _generar_slugs(self, nombres):
+        """
+        Genera un slug único por nombre (igual que en la subida del dashboard),
+        consultando la base de datos una sola vez por página.
+        """
+        base = [slugify(nombre)[:240] or get_random_string(8).lower() for nombre in nombres]
+
+        usados = set(Archivo.objects.filter(slug__in=base).values_list('slug', flat=True))
+        slugs = []
+        for slug in base:
+            while slug in usados:
+                slug = f"{slug}-{get_random_string(4)}"
+            usados.add(slug)
+            slugs.append(slug)
+        return slugs
+
+    def _leer_checkpoint(self, path):
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _guardar_checkpoint(self, path, data):
+        # Escribimos a un temporal y renombramos para no dejar un checkpoint a medias
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
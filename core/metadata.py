@@ -0,0 +1,122 @@
+# core/metadata.py
+import hashlib
+import importlib
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection
+
+from .models import Archivo
+
+# Se puede apagar todo el procesamiento desde settings.py
+METADATA_ENABLED = getattr(settings, 'ARCHIVO_METADATA_ENABLED', True)
+METADATA_WORKERS = getattr(settings, 'ARCHIVO_METADATA_WORKERS', 2)
+# Archivos más grandes no se procesan (evita llenar la memoria de los workers)
+METADATA_MAX_BYTES = getattr(settings, 'ARCHIVO_METADATA_MAX_BYTES', 25 * 1024 * 1024)
+# Trabajos en curso + en espera por worker. Si se llena, el archivo se queda sin
+# miniatura en lugar de acumular copias de varios MB en memoria.
+METADATA_MAX_PENDING = getattr(settings, 'ARCHIVO_METADATA_MAX_PENDING', 4)
+
+THUMBNAIL_SIZE = (240, 240)
+
+
+def _optional(module_name):
+    """
+    Importa una librería opcional dentro del hilo de trabajo (no al arrancar el worker).
+    Devuelve None si no está instalada: en ese caso solo guardamos tamaño y tipo MIME.
+    """
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        return None
+
+
+_executor = None
+_pendientes = threading.BoundedSemaphore(METADATA_MAX_PENDING)
+
+
+def _get_executor():
+    # Se crea en el primer uso para que cada worker de gunicorn tenga su propio pool
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=METADATA_WORKERS, thread_name_prefix='metadata')
+    return _executor
+
+
+def schedule(archivo_id, file_obj):
+    """
+    Manda a procesar un archivo recién subido en segundo plano.
+    Los bytes se leen aquí porque el upload temporal se borra al terminar el request.
+    """
+    mime_type = file_obj.content_type or ''
+    procesable = mime_type == 'application/pdf' or mime_type.startswith('image/')
+    if not METADATA_ENABLED or not procesable or file_obj.size > METADATA_MAX_BYTES:
+        return None
+
+    if not _pendientes.acquire(blocking=False):
+        print(f"Cola de metadatos llena; el archivo {archivo_id} se queda sin miniatura")
+        return None
+
+    try:
+        file_obj.seek(0)
+        contenido = file_obj.read()
+        return _get_executor().submit(_procesar, archivo_id, contenido, mime_type)
+    except Exception:
+        _pendientes.release()
+        raise
+
+
+def _procesar(archivo_id, contenido, mime_type):
+    try:
+        datos = extract(contenido, mime_type)
+        if datos:
+            Archivo.objects.filter(pk=archivo_id).update(**datos)
+    except Exception as e:
+        print(f"Error al extraer metadatos del archivo {archivo_id}: {e}")
+    finally:
+        # Cada hilo del pool tiene su propia conexión a la BD
+        connection.close()
+        _pendientes.release()
+
+
+def extract(contenido, mime_type):
+    """
+    Devuelve un diccionario con los campos que se pudieron extraer:
+    'paginas' (PDF) y/o 'miniatura' (JPEG de imágenes) con su 'miniatura_etag'.
+    """
+    if mime_type == 'application/pdf':
+        return _extract_pdf(contenido)
+    if mime_type and mime_type.startswith('image/'):
+        datos = _extract_image(contenido)
+        if datos.get('miniatura'):
+            # El ETag se calcula una sola vez aquí para que la vista no tenga que leer ni hashear la imagen
+            datos['miniatura_etag'] = hashlib.md5(datos['miniatura']).hexdigest()
+        return datos
+    return {}
+
+
+def _extract_image(contenido):
+    pil_image = _optional('PIL.Image')
+    if pil_image is None:
+        return {}
+    with pil_image.open(io.BytesIO(contenido)) as img:
+        return {'miniatura': _thumbnail_jpeg(img)}
+
+
+def _extract_pdf(contenido):
+    # Solo número de páginas: renderizar la primera página requiere PyMuPDF (AGPL),
+    # que no usamos por su licencia; los PDFs se quedan sin miniatura.
+    pypdf = _optional('pypdf')
+    if pypdf is None:
+        return {}
+    return {'paginas': len(pypdf.PdfReader(io.BytesIO(contenido)).pages)}
+
+
+def _thumbnail_jpeg(img):
+    img = img.convert('RGB')
+    img.thumbnail(THUMBNAIL_SIZE)
+    salida = io.BytesIO()
+    img.save(salida, format='JPEG', quality=75, optimize=True)
+    return salida.getvalue()
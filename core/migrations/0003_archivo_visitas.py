@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 20:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_remove_perfilusuario_area_perfilusuario_areas_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivo',
+            name='visitas',
+            field=models.PositiveIntegerField(default=0, verbose_name='Visitas'),
+        ),
+    ]
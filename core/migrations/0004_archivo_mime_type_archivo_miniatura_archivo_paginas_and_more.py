@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-19 20:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_archivo_visitas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivo',
+            name='mime_type',
+            field=models.CharField(blank=True, max_length=255, verbose_name='Tipo MIME'),
+        ),
+        migrations.AddField(
+            model_name='archivo',
+            name='miniatura',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivo',
+            name='paginas',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Páginas'),
+        ),
+        migrations.AddField(
+            model_name='archivo',
+            name='tamano_bytes',
+            field=models.PositiveBigIntegerField(blank=True, null=True, verbose_name='Tamaño (bytes)'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.1 on 2026-10-19 20:40
+
+from django.db import migrations, models
+
+import core.models
+
+
+def asignar_codigos(apps, schema_editor):
+    # Cada fila existente necesita su propio código (un default se evaluaría una sola vez)
+    Archivo = apps.get_model('core', 'Archivo')
+    usados = set()
+    for archivo in Archivo.objects.only('id').iterator():
+        codigo = core.models.generar_codigo_corto()
+        while codigo in usados:
+            codigo = core.models.generar_codigo_corto()
+        usados.add(codigo)
+        Archivo.objects.filter(pk=archivo.pk).update(codigo_corto=codigo)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_archivo_mime_type_archivo_miniatura_archivo_paginas_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivo',
+            name='codigo_corto',
+            field=models.CharField(editable=False, max_length=8, null=True, verbose_name='Código corto'),
+        ),
+        migrations.RunPython(asignar_codigos, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='archivo',
+            name='codigo_corto',
+            field=models.CharField(default=core.models.generar_codigo_corto, editable=False, max_length=8, unique=True, verbose_name='Código corto'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-19 21:05
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def calcular_etags(apps, schema_editor):
+    # Miniaturas generadas antes de este campo: su ETag se calcula una sola vez aquí
+    Archivo = apps.get_model('core', 'Archivo')
+    for archivo in Archivo.objects.filter(miniatura__isnull=False).only('id', 'miniatura').iterator():
+        if archivo.miniatura:
+            etag = hashlib.md5(bytes(archivo.miniatura)).hexdigest()
+            Archivo.objects.filter(pk=archivo.pk).update(miniatura_etag=etag)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_archivo_codigo_corto'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivo',
+            name='miniatura_etag',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+        migrations.RunPython(calcular_etags, migrations.RunPython.noop),
+    ]
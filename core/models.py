@@ -1,16 +1,37 @@
 # models.py (VERSIÓN MULTI-ÁREA)
 
 from django.db import models
+from django.core.exceptions import ValidationError
 from django.contrib.auth.models import User
 from django.utils.text import slugify
+from django.utils.crypto import get_random_string
+
+# Códigos cortos aleatorios (base62) para los links de QR: no se pueden adivinar contando
+CODIGO_CORTO_LENGTH = 8
+
+def generar_codigo_corto():
+    return get_random_string(CODIGO_CORTO_LENGTH)
+
+# Primeros segmentos de URL que ya usan otras rutas (ver core/urls.py y link_generator/urls.py).
+# Un área con uno de estos slugs perdería sus links públicos /<area>/<archivo>/.
+SLUGS_RESERVADOS = {'r', 'admin', 'dashboard', 'delete_file', 'logout', 'static', 'media'}
 
 class AreaMunicipal(models.Model):
     nombre = models.CharField(max_length=100, unique=True, verbose_name="Nombre del Área")
     slug = models.SlugField(max_length=100, unique=True, blank=True, help_text="Se genera automáticamente")
 
+    def _validar_slug(self, slug):
+        if slug.lower() in SLUGS_RESERVADOS:
+            raise ValidationError({'slug': f"El slug '{slug}' está reservado por el sistema. Elige otro."})
+
+    def clean(self):
+        super().clean()
+        self._validar_slug(self.slug or slugify(self.nombre))
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.nombre)
+        self._validar_slug(self.slug)
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -39,6 +60,20 @@ class Archivo(models.Model):
     google_drive_link = models.URLField(max_length=1024, verbose_name="Link de Google Drive")
     google_drive_file_id = models.CharField(max_length=255, verbose_name="ID del Archivo en Google Drive")
 
+    # Se incrementa por lotes desde core.shortlinks, no en cada visita
+    visitas = models.PositiveIntegerField(default=0, verbose_name="Visitas")
+    codigo_corto = models.CharField(
+        max_length=CODIGO_CORTO_LENGTH, unique=True, editable=False,
+        default=generar_codigo_corto, verbose_name="Código corto"
+    )
+
+    # Metadatos: tamaño y tipo se guardan al subir; páginas y miniatura los llena core.metadata
+    tamano_bytes = models.PositiveBigIntegerField(null=True, blank=True, verbose_name="Tamaño (bytes)")
+    mime_type = models.CharField(max_length=255, blank=True, verbose_name="Tipo MIME")
+    paginas = models.PositiveIntegerField(null=True, blank=True, verbose_name="Páginas")
+    miniatura = models.BinaryField(null=True, blank=True, editable=False)
+    miniatura_etag = models.CharField(max_length=32, blank=True, editable=False)
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.nombre_personalizado)
@@ -0,0 +1,129 @@
+# core/shortlinks.py
+import atexit
+import re
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, F, IntegerField, Value, When
+
+from .models import Archivo, CODIGO_CORTO_LENGTH
+
+# -----------------------------------------------------------------------------
+# ÍNDICE EN MEMORIA (código corto -> (ID, link de Drive))
+# -----------------------------------------------------------------------------
+# Cada worker guarda los links que ya resolvió; solo los códigos nuevos van a la BD.
+# Las entradas caducan a los INDEX_TTL segundos: así un archivo eliminado desde
+# otro worker deja de redirigir en este, como máximo, después de ese tiempo.
+INDEX_MAX_SIZE = getattr(settings, 'SHORTLINK_INDEX_MAX_SIZE', 50000)
+INDEX_TTL = getattr(settings, 'SHORTLINK_INDEX_TTL', 60)
+
+_CODIGO_VALIDO = re.compile(rf'^[0-9A-Za-z]{{{CODIGO_CORTO_LENGTH}}}$')
+
+_index = {}
+_index_lock = threading.Lock()
+
+
+def resolve(codigo):
+    """
+    Devuelve (id, link_de_drive) para un código corto, o None si no existe.
+    """
+    if not _CODIGO_VALIDO.match(codigo):
+        return None
+
+    ahora = time.monotonic()
+    entrada = _index.get(codigo)
+    if entrada is not None and entrada[2] > ahora:
+        return entrada[0], entrada[1]
+
+    fila = Archivo.objects.filter(codigo_corto=codigo).values_list('id', 'google_drive_link').first()
+    with _index_lock:
+        if fila is None:
+            _index.pop(codigo, None)
+            return None
+        if len(_index) >= INDEX_MAX_SIZE:
+            _index.clear()
+        _index[codigo] = (fila[0], fila[1], ahora + INDEX_TTL)
+    return fila
+
+
+def forget(codigo):
+    """
+    Quita un código del índice de este worker. Llamarla DESPUÉS de borrar la fila,
+    para que un resolve() concurrente no vuelva a meter el link eliminado.
+    """
+    with _index_lock:
+        _index.pop(codigo, None)
+
+
+# -----------------------------------------------------------------------------
+# CONTADOR DE VISITAS (agregado en memoria, guardado por lotes)
+# -----------------------------------------------------------------------------
+FLUSH_INTERVAL = getattr(settings, 'SHORTLINK_FLUSH_SECONDS', 30)
+
+_hits = Counter()
+_hits_lock = threading.Lock()
+_flusher = None
+
+
+def record_hit(archivo_id):
+    """
+    Suma una visita en memoria. No toca la base de datos.
+    """
+    with _hits_lock:
+        _hits[archivo_id] += 1
+    _ensure_flusher()
+
+
+def flush_hits():
+    """
+    Guarda las visitas acumuladas con un solo UPDATE para todos los archivos.
+    Devuelve cuántos archivos se actualizaron.
+    """
+    global _hits
+    with _hits_lock:
+        pendientes, _hits = _hits, Counter()
+    if not pendientes:
+        return 0
+
+    incremento = Case(
+        *[When(pk=archivo_id, then=Value(n)) for archivo_id, n in pendientes.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    try:
+        Archivo.objects.filter(pk__in=pendientes.keys()).update(visitas=F('visitas') + incremento)
+    except Exception as e:
+        print(f"Error al guardar visitas: {e}")
+        # Devolvemos las visitas al contador para el siguiente intento
+        with _hits_lock:
+            _hits.update(pendientes)
+        return 0
+    return len(pendientes)
+
+
+def _flush_loop():
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        flush_hits()
+        # El hilo tiene su propia conexión; la cerramos para no dejarla abierta entre lotes
+        connection.close()
+
+
+def _ensure_flusher():
+    """
+    Arranca el hilo que guarda las visitas. Se hace en la primera visita
+    (y no al importar) para que cada worker de gunicorn tenga el suyo.
+    """
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _hits_lock:
+        if _flusher is None or not _flusher.is_alive():
+            _flusher = threading.Thread(target=_flush_loop, name='shortlinks-flush', daemon=True)
+            _flusher.start()
+
+
+atexit.register(flush_hits)
@@ -6,6 +6,12 @@ urlpatterns = [
     path('', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
     path('delete_file/<int:file_id>/', views.delete_file, name='delete_file'),
+    path('dashboard/export/<slug:area_slug>/', views.export_links, name='export_links'),
+    path('dashboard/miniatura/<int:file_id>/', views.thumbnail, name='thumbnail'),
+
+    # URL corta (base62) para códigos QR; va antes de serve_file para que no la capture
+    # ('r' está en models.SLUGS_RESERVADOS, así que ningún área puede usarlo)
+    path('r/<str:code>/', views.short_redirect, name='short_redirect'),
 
     # La URL pública para visualizar archivos
     path('<slug:area_slug>/<slug:file_slug>/', views.serve_file, name='serve_file'),
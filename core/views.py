@@ -6,11 +6,15 @@ from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.utils.text import slugify
 from django.utils.crypto import get_random_string
-from django.http import HttpResponseForbidden
+from django.http import Http404, HttpResponse, HttpResponseForbidden, HttpResponseBadRequest, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
 
-from .models import Archivo, PerfilUsuario
+from .models import Archivo, AreaMunicipal, PerfilUsuario
 from .forms import UploadFileForm, LoginForm
 from . import google_drive_service 
+from . import exports
+from . import shortlinks
+from . import metadata
 
 @login_required
 def dashboard(request):
@@ -54,14 +58,18 @@ def dashboard(request):
                         area_slug=area_seleccionada.slug
                     )
                     
-                    Archivo.objects.create(
+                    archivo = Archivo.objects.create(
                         nombre_personalizado=nombre_original,
                         slug=slug_potencial,
                         area=area_seleccionada, # Asignamos al área elegida
                         subido_por=request.user,
                         google_drive_link=drive_data['link'],
-                        google_drive_file_id=drive_data['id']
+                        google_drive_file_id=drive_data['id'],
+                        tamano_bytes=archivo_subido.size,
+                        mime_type=archivo_subido.content_type or ''
                     )
+                    # Páginas y miniatura se calculan en segundo plano (no retrasa la respuesta)
+                    metadata.schedule(archivo.id, archivo_subido)
                 except Exception as e:
                     print(f"Error al subir '{archivo_subido.name}': {e}")
                     continue 
@@ -74,7 +82,8 @@ def dashboard(request):
     # Creamos una lista de diccionarios. Cada item tiene el objeto Area y sus archivos.
     dashboard_data = []
     for area in user_areas:
-        archivos_area = Archivo.objects.filter(area=area).order_by('-fecha_creacion')
+        # No cargamos los bytes de la miniatura; 'miniatura_etag' basta para saber si existe
+        archivos_area = Archivo.objects.filter(area=area).defer('miniatura').order_by('-fecha_creacion')
         dashboard_data.append({
             'area_obj': area,
             'archivos': archivos_area
@@ -91,7 +100,7 @@ def delete_file(request, file_id):
     """
     Elimina archivo validando que el usuario pertenezca al área del archivo.
     """
-    archivo = get_object_or_404(Archivo, id=file_id)
+    archivo = get_object_or_404(Archivo.objects.defer('miniatura'), id=file_id)
     
     # SEGURIDAD: Verificar si el área del archivo está entre las áreas del usuario
     if archivo.area not in request.user.perfilusuario.areas.all():
@@ -101,18 +110,84 @@ def delete_file(request, file_id):
         try:
             google_drive_service.delete_file_from_drive(archivo.google_drive_file_id)
             archivo.delete()
+            shortlinks.forget(archivo.codigo_corto)
         except Exception as e:
             print(f"Error eliminando archivo: {e}")
         
     return redirect('dashboard')
 
+@login_required
+def export_links(request, area_slug):
+    """
+    Descarga en streaming (CSV o NDJSON) de todos los links públicos de un área.
+    """
+    area = get_object_or_404(AreaMunicipal, slug=area_slug)
+
+    # SEGURIDAD: Solo se exportan áreas asignadas al usuario
+    if area not in request.user.perfilusuario.areas.all():
+        return HttpResponseForbidden("No tienes permiso para exportar archivos de esta área.")
+
+    formato = request.GET.get('formato', 'csv')
+    if formato not in exports.FORMATOS:
+        return HttpResponseBadRequest("Formato no soportado. Usa 'csv' o 'ndjson'.")
+
+    content_type = 'text/csv' if formato == 'csv' else 'application/x-ndjson'
+    response = StreamingHttpResponse(
+        exports.stream_export(area, formato, base_url=request.build_absolute_uri('/')),
+        content_type=f"{content_type}; charset=utf-8"
+    )
+    response['Content-Disposition'] = f'attachment; filename="links-{area.slug}.{formato}"'
+    return response
+
+@login_required
+def thumbnail(request, file_id):
+    """
+    Devuelve la miniatura JPEG de un archivo con cabeceras de caché (como un estático),
+    solo a usuarios del área del archivo.
+    """
+    # Primero solo el ETag: si el navegador ya la tiene, respondemos 304 sin leer la imagen
+    archivo = get_object_or_404(Archivo.objects.only('area', 'miniatura_etag'), id=file_id)
+
+    # SEGURIDAD: La miniatura muestra el contenido del archivo
+    if archivo.area not in request.user.perfilusuario.areas.all():
+        return HttpResponseForbidden("No tienes permiso para ver archivos de esta área.")
+
+    if not archivo.miniatura_etag:
+        raise Http404("Miniatura no disponible")
+
+    etag = f'"{archivo.miniatura_etag}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        miniatura = Archivo.objects.filter(id=file_id).values_list('miniatura', flat=True).first()
+        if not miniatura:
+            raise Http404("Miniatura no disponible")
+        response = HttpResponse(bytes(miniatura), content_type='image/jpeg')
+    response['ETag'] = etag
+    # 'private': solo el navegador del usuario la guarda, nunca un caché compartido
+    patch_cache_control(response, private=True, max_age=60 * 60 * 24 * 30)
+    return response
+
 def serve_file(request, area_slug, file_slug):
     """
-    Redirección pública (sin cambios de lógica, solo búsqueda).
+    Redirección pública al link de Drive. La visita se cuenta en memoria (core.shortlinks).
     """
-    archivo = get_object_or_404(Archivo, area__slug=area_slug, slug=file_slug)
+    archivo = get_object_or_404(
+        Archivo.objects.only('id', 'google_drive_link'), area__slug=area_slug, slug=file_slug
+    )
+    shortlinks.record_hit(archivo.id)
     return redirect(archivo.google_drive_link)
 
+def short_redirect(request, code):
+    """
+    Redirección pública por código corto (para QR). No consulta la BD si el código ya está en memoria.
+    """
+    resultado = shortlinks.resolve(code)
+    if resultado is None:
+        raise Http404("Link no encontrado")
+    archivo_id, link = resultado
+    shortlinks.record_hit(archivo_id)
+    return redirect(link)
+
 def login_view(request):
     if request.user.is_authenticated:
         return redirect('dashboard')
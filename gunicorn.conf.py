@@ -0,0 +1,17 @@
+# gunicorn.conf.py (gunicorn lo lee automáticamente desde la raíz del proyecto)
+import os
+
+wsgi_app = 'link_generator.wsgi:application'
+timeout = 120
+
+# Carga Django una sola vez en el maestro; los workers lo heredan al hacer fork,
+# así que arrancan (y escalan) sin volver a importar toda la app.
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+
+def when_ready(server):
+    # Corre en el maestro antes de crear los workers: con preload, las librerías
+    # de Drive quedan importadas y compartidas por todos los workers.
+    if server.cfg.preload_app:
+        from core import google_drive_service
+        google_drive_service.warmup()